@@ -1,41 +1,72 @@
 from __future__ import annotations
 
+import cProfile
 import logging
+import os
 
 import voluptuous as vol
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant, ServiceCall
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
 from homeassistant.helpers import config_validation as cv
 from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.dispatcher import async_dispatcher_send
 from homeassistant.helpers.event import async_track_time_change
+from homeassistant.util import dt as dt_util
+from homeassistant.util import slugify
 
 from .const import (
     CONF_ACCOUNT_NAME,
     CONF_PASSWORD,
+    CONF_RECORD_RESPONSES,
     CONF_REFRESH_HOUR,
     CONF_REFRESH_MINUTE,
     CONF_REFRESH_TIMES,
     CONF_USERNAME,
+    CONFIG_VERSION,
+    DATA_SEARCH_INDEX,
     DOMAIN,
     PLATFORMS,
     DEFAULT_REFRESH_HOUR,
     DEFAULT_REFRESH_MINUTE,
     DEFAULT_REFRESH_SECOND,
+    FIXTURES_DIR,
+    PROFILES_DIR,
     parse_refresh_times,
+    SERVICE_PROFILE_REFRESH,
     SERVICE_RENEW_ALL,
     SERVICE_RENEW_LOAN,
     SERVICE_REFRESH,
+    SERVICE_SEARCH,
+    SIGNAL_LOANS_UPDATED,
 )
+from .calendar import async_unload_calendar
 from .coordinator import LeitirCoordinator
+from .fixtures import FixtureRecorder
+from .renewal import RenewalCache
+from .replay import async_replay_fixtures
+from .search import LoanSearchIndex
+from .websocket_api import async_register_websocket_commands
 
 _LOGGER = logging.getLogger(__name__)
 
 CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
 
 
+def _dump_stats(profiler: cProfile.Profile, path: str) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    profiler.dump_stats(path)
+
+
 async def async_setup(hass: HomeAssistant, config: dict) -> bool:
     hass.data.setdefault(DOMAIN, {})
+    search_index = hass.data.setdefault(DATA_SEARCH_INDEX, LoanSearchIndex())
 
     async def handle_renew_loan(call: ServiceCall) -> None:
         loan_id = call.data["loan_id"]
@@ -50,6 +81,34 @@ async def async_setup(hass: HomeAssistant, config: dict) -> bool:
         for coord in hass.data[DOMAIN].values():
             await coord.async_request_refresh()
 
+    async def handle_profile_refresh(call: ServiceCall) -> None:
+        entry_id = call.data.get("entry_id")
+        fixtures = call.data.get("fixtures")
+        path = hass.config.path(
+            PROFILES_DIR, f"refresh_{dt_util.now():%Y%m%d_%H%M%S}.prof"
+        )
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError as err:
+            _LOGGER.error("Cannot profile refresh while another profiler is active: %s", err)
+            return
+        try:
+            if fixtures:
+                cycles = await async_replay_fixtures(hass, hass.config.path(fixtures))
+                _LOGGER.debug("Replayed %s refresh cycles for profiling", len(cycles))
+            else:
+                for coord_entry_id, coord in hass.data[DOMAIN].items():
+                    if entry_id is None or coord_entry_id == entry_id:
+                        await coord.async_refresh()
+        finally:
+            profiler.disable()
+        await hass.async_add_executor_job(_dump_stats, profiler, path)
+        _LOGGER.info("Wrote refresh profile to %s", path)
+
+    async def handle_search(call: ServiceCall) -> ServiceResponse:
+        return {"results": search_index.search(call.data["query"], call.data["limit"])}
+
     hass.services.async_register(
         DOMAIN,
         SERVICE_RENEW_LOAN,
@@ -58,27 +117,75 @@ async def async_setup(hass: HomeAssistant, config: dict) -> bool:
     )
     hass.services.async_register(DOMAIN, SERVICE_RENEW_ALL, handle_renew_all)
     hass.services.async_register(DOMAIN, SERVICE_REFRESH, handle_refresh)
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_PROFILE_REFRESH,
+        handle_profile_refresh,
+        schema=vol.Schema(
+            {
+                vol.Optional("entry_id"): cv.string,
+                vol.Optional("fixtures"): cv.string,
+            }
+        ),
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_SEARCH,
+        handle_search,
+        schema=vol.Schema(
+            {
+                vol.Required("query"): cv.string,
+                vol.Optional("limit", default=10): vol.All(
+                    vol.Coerce(int), vol.Range(min=1, max=100)
+                ),
+            }
+        ),
+        supports_response=SupportsResponse.ONLY,
+    )
+    async_register_websocket_commands(hass)
 
     return True
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
+    recorder = None
+    if entry.options.get(CONF_RECORD_RESPONSES):
+        fixtures_dir = hass.config.path(
+            FIXTURES_DIR, slugify(entry.data[CONF_ACCOUNT_NAME]) or entry.entry_id
+        )
+        _LOGGER.info("Recording sanitized Leitir responses to %s", fixtures_dir)
+        recorder = FixtureRecorder(hass, fixtures_dir)
+    renewal_cache = RenewalCache(hass, entry.entry_id)
+    await renewal_cache.async_load()
     coord = LeitirCoordinator(
         hass,
         entry.data[CONF_USERNAME],
         entry.data[CONF_PASSWORD],
         entry.data[CONF_ACCOUNT_NAME],
+        recorder=recorder,
+        renewal_cache=renewal_cache,
     )
     hass.data[DOMAIN][entry.entry_id] = coord
 
-    registry = er.async_get(hass)
-    for reg_entry in er.async_entries_for_config_entry(registry, entry.entry_id):
-        if reg_entry.domain == "binary_sensor" and reg_entry.platform == DOMAIN:
-            _LOGGER.debug("Removing legacy binary sensor entity %s", reg_entry.entity_id)
-            registry.async_remove(reg_entry.entity_id)
-
     await coord.async_config_entry_first_refresh()
 
+    search_index: LoanSearchIndex = hass.data[DATA_SEARCH_INDEX]
+
+    @callback
+    def _update_search_index() -> None:
+        if coord.last_update_success:
+            search_index.update(entry.entry_id, coord.account_name, coord.data or {})
+
+    _update_search_index()
+    entry.async_on_unload(coord.async_add_listener(_update_search_index))
+    entry.async_on_unload(lambda: search_index.remove_entry(entry.entry_id))
+
+    @callback
+    def _signal_loans_updated() -> None:
+        async_dispatcher_send(hass, SIGNAL_LOANS_UPDATED)
+
+    entry.async_on_unload(coord.async_add_listener(_signal_loans_updated))
+
     try:
         refresh_times = parse_refresh_times(entry.options.get(CONF_REFRESH_TIMES))
     except ValueError:
@@ -103,10 +210,56 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
             )
         )
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    async_dispatcher_send(hass, SIGNAL_LOANS_UPDATED)
+    return True
+
+
+async def async_migrate_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
+    if entry.version > CONFIG_VERSION:
+        return False
+
+    if entry.version == 1:
+        registry = er.async_get(hass)
+        account_label = entry.data.get(CONF_ACCOUNT_NAME) or entry.title or entry.entry_id
+        account_slug = slugify(account_label) or entry.entry_id
+        prefix = f"{entry.entry_id}_loan_"
+        for reg_entry in er.async_entries_for_config_entry(registry, entry.entry_id):
+            if reg_entry.platform != DOMAIN:
+                continue
+            if reg_entry.domain == "binary_sensor":
+                _LOGGER.debug("Removing legacy binary sensor entity %s", reg_entry.entity_id)
+                registry.async_remove(reg_entry.entity_id)
+                continue
+            unique_id = reg_entry.unique_id
+            if reg_entry.domain != "sensor" or not unique_id or not unique_id.startswith(prefix):
+                continue
+            desired_entity_id = f"sensor.{account_slug}_loan_{unique_id[len(prefix):]}"
+            if reg_entry.entity_id == desired_entity_id:
+                continue
+            if registry.async_get(desired_entity_id):
+                _LOGGER.warning(
+                    "Entity id %s already in use; keeping %s",
+                    desired_entity_id,
+                    reg_entry.entity_id,
+                )
+                continue
+            _LOGGER.debug(
+                "Renaming loan entity %s to %s", reg_entry.entity_id, desired_entity_id
+            )
+            registry.async_update_entity(reg_entry.entity_id, new_entity_id=desired_entity_id)
+        hass.config_entries.async_update_entry(entry, version=2)
+
+    _LOGGER.debug("Migrated %s to version %s", entry.entry_id, entry.version)
     return True
 
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     hass.data[DOMAIN].pop(entry.entry_id, None)
+    async_unload_calendar(hass, entry.entry_id)
+    async_dispatcher_send(hass, SIGNAL_LOANS_UPDATED)
     return True
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    await RenewalCache(hass, entry.entry_id).async_remove()
@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+from typing import Any
+
+from .loan import loan_field
+
+_READY_STATUSES = {
+    "hold_shelf",
+    "on_hold_shelf",
+    "ready",
+    "ready_for_pickup",
+    "tilbúið",
+    "tilbúið_til_afhendingar",
+    "tilbúin_til_afhendingar",
+}
+
+
+def _records_from_data(
+    data: dict[str, Any] | None, paths: tuple[tuple[str, ...], ...]
+) -> list[dict[str, Any]]:
+    if not data:
+        return []
+    for path in paths:
+        cursor: Any = data
+        for key in path:
+            if not isinstance(cursor, dict) or key not in cursor:
+                cursor = None
+                break
+            cursor = cursor[key]
+        if cursor is None:
+            continue
+        if isinstance(cursor, list):
+            return [item for item in cursor if isinstance(item, dict)]
+        if isinstance(cursor, dict):
+            return [cursor]
+    return []
+
+
+def holds_from_data(data: dict[str, Any] | None) -> list[dict[str, Any]]:
+    return _records_from_data(
+        data,
+        (
+            ("data", "requests", "request"),
+            ("requests", "request"),
+            ("data", "holds", "hold"),
+            ("data", "request"),
+            ("request",),
+        ),
+    )
+
+
+def fines_from_data(data: dict[str, Any] | None) -> list[dict[str, Any]]:
+    return _records_from_data(
+        data,
+        (
+            ("data", "fines", "fine"),
+            ("fines", "fine"),
+            ("data", "fine"),
+            ("fine",),
+        ),
+    )
+
+
+def hold_title(hold: dict[str, Any]) -> Any:
+    return loan_field(hold, "title", "title_display", "titleDisplay")
+
+
+def hold_status(hold: dict[str, Any]) -> Any:
+    return loan_field(hold, "requestStatus", "requeststatus", "status")
+
+
+def hold_pickup_location(hold: dict[str, Any]) -> Any:
+    return loan_field(hold, "pickupLocation", "pickuplocation", "pickup_location")
+
+
+def hold_expiry_date(hold: dict[str, Any]) -> Any:
+    return loan_field(hold, "expirydate", "expiryDate", "holdShelfExpiryDate")
+
+
+def hold_ready(hold: dict[str, Any]) -> bool:
+    status = hold_status(hold)
+    if status is None:
+        return False
+    normalized = "_".join(str(status).lower().replace("-", " ").replace("_", " ").split())
+    return normalized in _READY_STATUSES
+
+
+def hold_summary(hold: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "request_id": loan_field(hold, "requestId", "requestid", "request_id"),
+        "title": hold_title(hold),
+        "author": loan_field(hold, "author", "author_display", "authorDisplay"),
+        "status": hold_status(hold),
+        "pickup_location": hold_pickup_location(hold),
+        "expiry_date": hold_expiry_date(hold),
+    }
+
+
+def fine_amount(fine: dict[str, Any]) -> float | None:
+    raw = loan_field(fine, "finesum", "fineSum", "balance", "amount")
+    if raw is None:
+        return None
+    text = "".join(char for char in str(raw) if char.isdigit() or char in ",.-")
+    if "," in text and "." in text:
+        decimal = "," if text.rfind(",") > text.rfind(".") else "."
+        thousands = "." if decimal == "," else ","
+        text = text.replace(thousands, "").replace(decimal, ".")
+    elif "," in text:
+        whole, _, fraction = text.rpartition(",")
+        if len(fraction) == 3 or text.count(",") > 1:
+            text = text.replace(",", "")
+        else:
+            text = f"{whole.replace(',', '')}.{fraction}"
+    elif "." in text and (text.count(".") > 1 or len(text.rpartition(".")[2]) == 3):
+        text = text.replace(".", "")
+    try:
+        return float(text)
+    except ValueError:
+        return None
+
+
+def fines_total(fines: list[dict[str, Any]]) -> float:
+    total = 0.0
+    for fine in fines:
+        amount = fine_amount(fine)
+        if amount is not None:
+            total += amount
+    return total
+
+
+def fine_summary(fine: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "fine_id": loan_field(fine, "fineid", "fineId", "fine_id"),
+        "title": loan_field(fine, "title", "title_display", "titleDisplay"),
+        "type": loan_field(fine, "finetype", "fineType", "type"),
+        "amount": fine_amount(fine),
+        "date": loan_field(fine, "finedate", "fineDate", "date"),
+    }
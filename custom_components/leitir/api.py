@@ -37,15 +37,29 @@ class LeitirClient:
             raise RuntimeError("jwtData missing")
         return LeitirAuth(token=str(raw).strip('"'))
 
-    async def get_loans(self, token: str) -> dict[str, Any]:
-        url = (
-            f"{self._base}/primaws/rest/priv/myaccount/loans?bulk=50&lang=is&offset=1&type=active"
-        )
+    async def _get(self, token: str, url: str) -> dict[str, Any]:
         headers = {"Accept": "application/json", "Authorization": f"Bearer {token}"}
         async with self._session.get(url, headers=headers) as resp:
             resp.raise_for_status()
             return await resp.json()
 
+    async def get_loans(self, token: str, loan_type: str = "active") -> dict[str, Any]:
+        url = (
+            f"{self._base}/primaws/rest/priv/myaccount/loans?bulk=50&lang=is&offset=1&type={loan_type}"
+        )
+        return await self._get(token, url)
+
+    async def get_loan_history(self, token: str) -> dict[str, Any]:
+        return await self.get_loans(token, loan_type="history")
+
+    async def get_requests(self, token: str) -> dict[str, Any]:
+        url = f"{self._base}/primaws/rest/priv/myaccount/requests?lang=is"
+        return await self._get(token, url)
+
+    async def get_fines(self, token: str) -> dict[str, Any]:
+        url = f"{self._base}/primaws/rest/priv/myaccount/fines?lang=is"
+        return await self._get(token, url)
+
     async def renew_loan(self, token: str, loan_id: str) -> dict[str, Any]:
         url = f"{self._base}/primaws/rest/priv/myaccount/renew_loans?lang=is"
         headers = {
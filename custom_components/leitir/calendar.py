@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+import logging
+from datetime import date, datetime, timedelta
+from typing import Any
+
+from homeassistant.components.calendar import CalendarEntity, CalendarEvent
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from homeassistant.util import dt as dt_util
+
+from .const import DATA_ALL_CALENDAR, DATA_CALENDAR_ADDERS, DOMAIN
+from .coordinator import LeitirCoordinator
+from .loan import loan_author, loan_id, loan_renewable, loan_title, loan_title_clean
+
+_LOGGER = logging.getLogger(__name__)
+
+
+async def async_setup_entry(
+    hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback
+):
+    coord: LeitirCoordinator = hass.data[DOMAIN][entry.entry_id]
+    entities: list[CalendarEntity] = [LeitirDueCalendar(coord, entry.entry_id)]
+    hass.data.setdefault(DATA_CALENDAR_ADDERS, {})[entry.entry_id] = async_add_entities
+
+    all_calendar: LeitirAllDueCalendar | None = hass.data.get(DATA_ALL_CALENDAR)
+    if all_calendar is None:
+        all_calendar = LeitirAllDueCalendar(entry.entry_id)
+        hass.data[DATA_ALL_CALENDAR] = all_calendar
+        entities.append(all_calendar)
+    all_calendar.track(entry.entry_id, coord)
+
+    async_add_entities(entities)
+
+
+@callback
+def async_unload_calendar(hass: HomeAssistant, entry_id: str) -> None:
+    adders: dict[str, AddEntitiesCallback] = hass.data.get(DATA_CALENDAR_ADDERS, {})
+    adders.pop(entry_id, None)
+    all_calendar: LeitirAllDueCalendar | None = hass.data.get(DATA_ALL_CALENDAR)
+    if all_calendar is not None:
+        all_calendar.untrack(entry_id)
+        return
+    coordinators: dict[str, LeitirCoordinator] = hass.data.get(DOMAIN, {})
+    owner_entry_id = next((key for key in adders if key in coordinators), None)
+    if owner_entry_id is None:
+        return
+    # The all-accounts calendar lived on the unloaded entry; hand it to another one.
+    _LOGGER.debug("Moving all-accounts calendar to %s", owner_entry_id)
+    all_calendar = LeitirAllDueCalendar(owner_entry_id)
+    hass.data[DATA_ALL_CALENDAR] = all_calendar
+    for coord_entry_id, coord in coordinators.items():
+        all_calendar.track(coord_entry_id, coord)
+    adders[owner_entry_id]([all_calendar])
+
+
+def _loan_event(due: date, loan: dict[str, Any], account_name: str | None = None) -> CalendarEvent:
+    loan_id_value = loan_id(loan)
+    title = loan_title_clean(loan) or loan_title(loan) or loan_id_value
+    summary = f"{account_name}: {title}" if account_name else str(title)
+    details = []
+    author = loan_author(loan)
+    if author:
+        details.append(str(author))
+    renewable = loan_renewable(loan)
+    if renewable is True:
+        details.append("Renewable")
+    elif renewable is False:
+        details.append("Not renewable")
+    return CalendarEvent(
+        start=due,
+        end=due + timedelta(days=1),
+        summary=summary,
+        description="\n".join(details) or None,
+        uid=f"{loan_id_value}_{due:%Y%m%d}",
+    )
+
+
+def _events_between(
+    coord: LeitirCoordinator,
+    start_date: datetime,
+    end_date: datetime,
+    account_name: str | None = None,
+) -> list[CalendarEvent]:
+    start_day = dt_util.as_local(start_date).date()
+    end_day = dt_util.as_local(end_date).date() + timedelta(days=1)
+    events = []
+    for due, loan in coord.due_index.between(start_day, end_day):
+        if dt_util.start_of_local_day(due) >= end_date:
+            continue
+        if dt_util.start_of_local_day(due + timedelta(days=1)) <= start_date:
+            continue
+        events.append(_loan_event(due, loan, account_name))
+    return events
+
+
+class LeitirDueCalendar(CoordinatorEntity, CalendarEntity):
+    def __init__(self, coord: LeitirCoordinator, entry_id: str):
+        super().__init__(coord)
+        self._attr_unique_id = f"{entry_id}_due_dates"
+        self._attr_name = f"{coord.account_name} Due Dates"
+        self._attr_suggested_object_id = f"{coord.account_name}_due_dates"
+
+    @property
+    def event(self) -> CalendarEvent | None:
+        upcoming = self.coordinator.due_index.next_due(dt_util.now().date())
+        if upcoming is None:
+            return None
+        return _loan_event(*upcoming)
+
+    async def async_get_events(
+        self, hass: HomeAssistant, start_date: datetime, end_date: datetime
+    ) -> list[CalendarEvent]:
+        return _events_between(self.coordinator, start_date, end_date)
+
+
+class LeitirAllDueCalendar(CalendarEntity):
+    _attr_should_poll = False
+
+    def __init__(self, owner_entry_id: str):
+        self.owner_entry_id = owner_entry_id
+        self._coordinators: dict[str, LeitirCoordinator] = {}
+        self._unsubs: dict[str, CALLBACK_TYPE] = {}
+        self._attr_unique_id = f"{DOMAIN}_all_due_dates"
+        self._attr_name = "Leitir Due Dates"
+        self._attr_suggested_object_id = "leitir_due_dates"
+
+    @callback
+    def track(self, entry_id: str, coord: LeitirCoordinator) -> None:
+        if entry_id in self._unsubs:
+            return
+        self._coordinators[entry_id] = coord
+        self._unsubs[entry_id] = coord.async_add_listener(self._handle_coordinator_update)
+        self._handle_coordinator_update()
+
+    @callback
+    def untrack(self, entry_id: str) -> None:
+        self._coordinators.pop(entry_id, None)
+        unsub = self._unsubs.pop(entry_id, None)
+        if unsub is not None:
+            unsub()
+        self._handle_coordinator_update()
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        if self.hass is not None and self.entity_id:
+            self.async_write_ha_state()
+
+    async def async_will_remove_from_hass(self) -> None:
+        await super().async_will_remove_from_hass()
+        for unsub in self._unsubs.values():
+            unsub()
+        self._unsubs.clear()
+        self._coordinators.clear()
+        if self.hass.data.get(DATA_ALL_CALENDAR) is self:
+            self.hass.data.pop(DATA_ALL_CALENDAR)
+
+    @property
+    def event(self) -> CalendarEvent | None:
+        today = dt_util.now().date()
+        best: tuple[date, dict[str, Any], str] | None = None
+        for coord in self._coordinators.values():
+            upcoming = coord.due_index.next_due(today)
+            if upcoming is None:
+                continue
+            if best is None or upcoming[0] < best[0]:
+                best = (upcoming[0], upcoming[1], coord.account_name)
+        if best is None:
+            return None
+        return _loan_event(*best)
+
+    async def async_get_events(
+        self, hass: HomeAssistant, start_date: datetime, end_date: datetime
+    ) -> list[CalendarEvent]:
+        events: list[CalendarEvent] = []
+        for coord in self._coordinators.values():
+            events.extend(
+                _events_between(coord, start_date, end_date, coord.account_name)
+            )
+        events.sort(key=lambda event: (event.start, event.summary))
+        return events
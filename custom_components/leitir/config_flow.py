@@ -9,10 +9,12 @@ from .api import LeitirClient
 from .const import (
     CONF_ACCOUNT_NAME,
     CONF_PASSWORD,
+    CONF_RECORD_RESPONSES,
     CONF_REFRESH_HOUR,
     CONF_REFRESH_MINUTE,
     CONF_REFRESH_TIMES,
     CONF_USERNAME,
+    CONFIG_VERSION,
     DEFAULT_REFRESH_HOUR,
     DEFAULT_REFRESH_MINUTE,
     DOMAIN,
@@ -21,7 +23,7 @@ from .const import (
 
 
 class LeitirConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
-    VERSION = 1
+    VERSION = CONFIG_VERSION
 
     @staticmethod
     def async_get_options_flow(config_entry: config_entries.ConfigEntry):
@@ -90,6 +92,10 @@ class LeitirOptionsFlowHandler(config_entries.OptionsFlow):
         schema = vol.Schema(
             {
                 vol.Required(CONF_REFRESH_TIMES, default=refresh_times): str,
+                vol.Optional(
+                    CONF_RECORD_RESPONSES,
+                    default=self.config_entry.options.get(CONF_RECORD_RESPONSES, False),
+                ): bool,
             }
         )
         return self.async_show_form(
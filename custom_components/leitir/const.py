@@ -1,7 +1,9 @@
+from datetime import timedelta
 from typing import Any
 
 DOMAIN = "leitir"
-PLATFORMS = ["sensor"]
+PLATFORMS = ["sensor", "calendar"]
+CONFIG_VERSION = 2
 
 CONF_ACCOUNT_NAME = "account_name"
 CONF_USERNAME = "username"
@@ -9,14 +11,46 @@ CONF_PASSWORD = "password"
 CONF_REFRESH_HOUR = "refresh_hour"
 CONF_REFRESH_MINUTE = "refresh_minute"
 CONF_REFRESH_TIMES = "refresh_times"
+CONF_RECORD_RESPONSES = "record_responses"
 
 DEFAULT_REFRESH_HOUR = 18
 DEFAULT_REFRESH_MINUTE = 0
 DEFAULT_REFRESH_SECOND = 0
 
+ENDPOINT_LOANS = "loans"
+ENDPOINT_HOLDS = "holds"
+ENDPOINT_FINES = "fines"
+ENDPOINT_HISTORY = "history"
+ENDPOINT_RENEW = "renew"
+
+ENDPOINT_REFRESH_INTERVALS = {
+    ENDPOINT_LOANS: timedelta(0),
+    ENDPOINT_HOLDS: timedelta(0),
+    ENDPOINT_FINES: timedelta(hours=12),
+    ENDPOINT_HISTORY: timedelta(hours=24),
+}
+ENDPOINT_REFRESH_SLACK = timedelta(minutes=5)
+
+OPERATION_REFRESH = "refresh"
+OPERATION_RENEW = "renew"
+
+PRIORITY_RENEW = 0
+PRIORITY_REFRESH = 10
+
+SIGNAL_LOANS_UPDATED = f"{DOMAIN}_loans_updated"
+
+DATA_ALL_CALENDAR = f"{DOMAIN}_all_calendar"
+DATA_CALENDAR_ADDERS = f"{DOMAIN}_calendar_adders"
+DATA_SEARCH_INDEX = f"{DOMAIN}_search_index"
+
 SERVICE_RENEW_LOAN = "renew_loan"
 SERVICE_RENEW_ALL = "renew_all"
 SERVICE_REFRESH = "refresh"
+SERVICE_PROFILE_REFRESH = "profile_refresh"
+SERVICE_SEARCH = "search"
+
+FIXTURES_DIR = "leitir_fixtures"
+PROFILES_DIR = "leitir_profiles"
 
 
 def _parse_time(value: str) -> tuple[int, int]:
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
+import asyncio
 import logging
+from datetime import datetime
 from typing import Any
 
 import aiohttp
@@ -8,23 +10,61 @@ import aiohttp
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
 
+from .account import fines_from_data, holds_from_data
 from .api import LeitirClient
+from .const import (
+    ENDPOINT_FINES,
+    ENDPOINT_HISTORY,
+    ENDPOINT_HOLDS,
+    ENDPOINT_LOANS,
+    ENDPOINT_REFRESH_INTERVALS,
+    ENDPOINT_REFRESH_SLACK,
+    ENDPOINT_RENEW,
+    OPERATION_REFRESH,
+    OPERATION_RENEW,
+    PRIORITY_REFRESH,
+    PRIORITY_RENEW,
+)
+from .due_index import DueDateIndex
+from .fixtures import FixtureRecorder
 from .loan import loan_id, loan_renewable, loans_from_data
+from .operations import OperationQueue
+from .renewal import RenewalCache
 
 _LOGGER = logging.getLogger(__name__)
 
 
 class LeitirCoordinator(DataUpdateCoordinator[dict[str, dict[str, Any]]]):
-    def __init__(self, hass: HomeAssistant, username: str, password: str, account_name: str):
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        username: str,
+        password: str,
+        account_name: str,
+        client: LeitirClient | None = None,
+        recorder: FixtureRecorder | None = None,
+        renewal_cache: RenewalCache | None = None,
+    ):
         self.hass = hass
         self.username = username
         self.password = password
         self.account_name = account_name
         self._token: str | None = None
+        self.due_index = DueDateIndex()
+        self.holds: list[dict[str, Any]] = []
+        self.fines: list[dict[str, Any]] = []
+        self.loan_history: list[dict[str, Any]] = []
+        self._endpoint_data: dict[str, dict[str, Any]] = {}
+        self._endpoint_fetched: dict[str, datetime] = {}
 
-        session = async_get_clientsession(hass)
-        self.client = LeitirClient(session)
+        self.recorder = recorder
+        self.renewal_cache = renewal_cache or RenewalCache(hass)
+        self.operations = OperationQueue(hass, f"Leitir {account_name}")
+        if client is None:
+            client = LeitirClient(async_get_clientsession(hass))
+        self.client = client
 
         super().__init__(
             hass,
@@ -39,12 +79,68 @@ class LeitirCoordinator(DataUpdateCoordinator[dict[str, dict[str, Any]]]):
             self._token = auth.token
         return self._token
 
+    def endpoint_loaded(self, endpoint: str) -> bool:
+        return endpoint in self._endpoint_data
+
+    def _endpoint_due(self, endpoint: str, now: datetime) -> bool:
+        fetched = self._endpoint_fetched.get(endpoint)
+        if fetched is None:
+            return True
+        return now - fetched >= ENDPOINT_REFRESH_INTERVALS[endpoint] - ENDPOINT_REFRESH_SLACK
+
+    async def _fetch_endpoints(self, token: str, retry_auth: bool) -> None:
+        fetchers = {
+            ENDPOINT_LOANS: self.client.get_loans,
+            ENDPOINT_HOLDS: self.client.get_requests,
+            ENDPOINT_FINES: self.client.get_fines,
+            ENDPOINT_HISTORY: self.client.get_loan_history,
+        }
+        now = dt_util.utcnow()
+        due = [endpoint for endpoint in fetchers if self._endpoint_due(endpoint, now)]
+        results = await asyncio.gather(
+            *(fetchers[endpoint](token) for endpoint in due), return_exceptions=True
+        )
+        for endpoint, result in zip(due, results):
+            if self.recorder is not None and isinstance(result, dict):
+                self.recorder.record(endpoint, result)
+            if (
+                isinstance(result, aiohttp.ClientResponseError)
+                and result.status in (401, 403)
+                and (retry_auth or endpoint == ENDPOINT_LOANS)
+            ):
+                raise result
+            if isinstance(result, BaseException) or result.get("status") != "ok":
+                if endpoint == ENDPOINT_LOANS:
+                    if isinstance(result, BaseException):
+                        raise result
+                    raise UpdateFailed(result)
+                _LOGGER.warning(
+                    "Failed to fetch %s for %s; keeping cached data: %s",
+                    endpoint,
+                    self.account_name,
+                    result,
+                )
+                continue
+            self._endpoint_data[endpoint] = result
+            self._endpoint_fetched[endpoint] = now
+        _LOGGER.debug("Fetched endpoints %s for %s", due, self.account_name)
+
     async def _async_update_data(self) -> dict[str, dict[str, Any]]:
+        return await self.operations.submit(
+            OPERATION_REFRESH,
+            PRIORITY_REFRESH,
+            self._async_fetch_data,
+            dedupe_key=OPERATION_REFRESH,
+        )
+
+    async def _async_fetch_data(self, retry_auth: bool = True) -> dict[str, dict[str, Any]]:
         try:
             token = await self._ensure_token()
-            data = await self.client.get_loans(token)
-            if data.get("status") != "ok":
-                raise UpdateFailed(data)
+            await self._fetch_endpoints(token, retry_auth)
+            data = self._endpoint_data[ENDPOINT_LOANS]
+            self.holds = holds_from_data(self._endpoint_data.get(ENDPOINT_HOLDS))
+            self.fines = fines_from_data(self._endpoint_data.get(ENDPOINT_FINES))
+            self.loan_history = loans_from_data(self._endpoint_data.get(ENDPOINT_HISTORY))
             loans_by_id: dict[str, dict[str, Any]] = {}
             for loan in loans_from_data(data):
                 loan_id_value = loan_id(loan)
@@ -52,18 +148,31 @@ class LeitirCoordinator(DataUpdateCoordinator[dict[str, dict[str, Any]]]):
                     continue
                 loans_by_id[str(loan_id_value)] = loan
             _LOGGER.debug("Fetched %s loans", len(loans_by_id))
+            self.due_index.update(loans_by_id)
+            self.renewal_cache.prune(loans_by_id)
             return loans_by_id
         except aiohttp.ClientResponseError as err:
-            if err.status in (401, 403):
+            if err.status in (401, 403) and retry_auth:
                 self._token = None
-                return await self._async_update_data()
+                return await self._async_fetch_data(retry_auth=False)
             raise UpdateFailed(err) from err
         except Exception as err:
             raise UpdateFailed(err) from err
 
-    async def renew_loan(self, loan_id: str) -> dict[str, Any]:
+    async def _async_renew(self, loan_id: str) -> dict[str, Any]:
         token = await self._ensure_token()
         result = await self.client.renew_loan(token, loan_id)
+        if self.recorder is not None:
+            self.recorder.record(ENDPOINT_RENEW, result)
+        loan = (self.data or {}).get(loan_id)
+        if loan is not None:
+            self.renewal_cache.record(loan_id, loan, result)
+        return result
+
+    async def renew_loan(self, loan_id: str) -> dict[str, Any]:
+        result = await self.operations.submit(
+            OPERATION_RENEW, PRIORITY_RENEW, lambda: self._async_renew(loan_id)
+        )
         await self.async_request_refresh()
         return result
 
@@ -73,6 +182,14 @@ class LeitirCoordinator(DataUpdateCoordinator[dict[str, dict[str, Any]]]):
             if not loan_renewable(loan):
                 continue
             loan_id_value = loan_id(loan)
-            if loan_id_value is not None:
-                results.append(await self.renew_loan(str(loan_id_value)))
+            if loan_id_value is None:
+                continue
+            if self.renewal_cache.should_skip(str(loan_id_value), loan):
+                _LOGGER.debug(
+                    "Skipping renewal of %s: %s",
+                    loan_id_value,
+                    self.renewal_cache.reason(str(loan_id_value)),
+                )
+                continue
+            results.append(await self.renew_loan(str(loan_id_value)))
         return results
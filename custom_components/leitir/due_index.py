@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+from bisect import bisect_left, insort
+from datetime import date
+from typing import Any, Iterator
+
+from .loan import loan_due_day
+
+
+class DueDateIndex:
+    def __init__(self) -> None:
+        self._entries: list[tuple[date, str]] = []
+        self._due_by_id: dict[str, date] = {}
+        self._loans: dict[str, dict[str, Any]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _remove(self, loan_id_value: str) -> None:
+        due = self._due_by_id.pop(loan_id_value, None)
+        if due is None:
+            return
+        key = (due, loan_id_value)
+        pos = bisect_left(self._entries, key)
+        if pos < len(self._entries) and self._entries[pos] == key:
+            del self._entries[pos]
+
+    def update(self, loans_by_id: dict[str, dict[str, Any]]) -> bool:
+        changed = False
+        for loan_id_value in list(self._loans):
+            if loan_id_value not in loans_by_id:
+                self._remove(loan_id_value)
+                del self._loans[loan_id_value]
+                changed = True
+        for loan_id_value, loan in loans_by_id.items():
+            due = loan_due_day(loan)
+            previous = self._due_by_id.get(loan_id_value)
+            if loan_id_value not in self._loans:
+                changed = True
+            self._loans[loan_id_value] = loan
+            if due == previous:
+                continue
+            self._remove(loan_id_value)
+            if due is not None:
+                self._due_by_id[loan_id_value] = due
+                insort(self._entries, (due, loan_id_value))
+            changed = True
+        return changed
+
+    def between(self, start: date, end: date) -> list[tuple[date, dict[str, Any]]]:
+        lo = bisect_left(self._entries, (start, ""))
+        hi = bisect_left(self._entries, (end, ""), lo)
+        return [
+            (due, self._loans[loan_id_value])
+            for due, loan_id_value in self._entries[lo:hi]
+        ]
+
+    def next_due(self, start: date) -> tuple[date, dict[str, Any]] | None:
+        pos = bisect_left(self._entries, (start, ""))
+        if pos >= len(self._entries):
+            return None
+        due, loan_id_value = self._entries[pos]
+        return due, self._loans[loan_id_value]
+
+    def iter_sorted(
+        self, start: date | None = None
+    ) -> Iterator[tuple[date | None, str, dict[str, Any]]]:
+        pos = 0 if start is None else bisect_left(self._entries, (start, ""))
+        for index in range(pos, len(self._entries)):
+            due, loan_id_value = self._entries[index]
+            yield due, loan_id_value, self._loans[loan_id_value]
+        for loan_id_value in sorted(self._loans):
+            if loan_id_value not in self._due_by_id:
+                yield None, loan_id_value, self._loans[loan_id_value]
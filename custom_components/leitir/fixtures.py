@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.util import dt as dt_util
+
+_LOGGER = logging.getLogger(__name__)
+
+REDACTED = "**REDACTED**"
+MAX_FIXTURES_PER_KIND = 20
+
+_SENSITIVE_KEYS = {
+    "address",
+    "barcode",
+    "email",
+    "firstname",
+    "jwtdata",
+    "lastname",
+    "password",
+    "phone",
+    "primaryid",
+    "userbarcode",
+    "userid",
+    "username",
+    "userprimaryid",
+}
+_SENSITIVE_PARTS = ("patron", "email", "phone", "password", "token")
+
+
+def _sensitive(key: str) -> bool:
+    lowered = key.lower().replace("_", "")
+    if lowered in _SENSITIVE_KEYS:
+        return True
+    return any(part in lowered for part in _SENSITIVE_PARTS)
+
+
+def sanitize(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {
+            key: REDACTED if isinstance(key, str) and _sensitive(key) else sanitize(item)
+            for key, item in value.items()
+        }
+    if isinstance(value, list):
+        return [sanitize(item) for item in value]
+    return value
+
+
+def load_fixtures(directory: str) -> dict[str, list[dict[str, Any]]]:
+    fixtures: dict[str, list[dict[str, Any]]] = {}
+    for name in sorted(os.listdir(directory)):
+        if not name.endswith(".json"):
+            continue
+        with open(os.path.join(directory, name), encoding="utf-8") as handle:
+            record = json.load(handle)
+        if not isinstance(record, dict) or "kind" not in record:
+            continue
+        fixtures.setdefault(record["kind"], []).append(record.get("response") or {})
+    return fixtures
+
+
+class FixtureRecorder:
+    def __init__(self, hass: HomeAssistant, directory: str) -> None:
+        self.hass = hass
+        self.directory = directory
+
+    def _write(self, path: str, record: dict[str, Any]) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as handle:
+            json.dump(record, handle, ensure_ascii=False, indent=2)
+        suffix = f"_{record['kind']}.json"
+        recorded = sorted(name for name in os.listdir(self.directory) if name.endswith(suffix))
+        for name in recorded[:-MAX_FIXTURES_PER_KIND]:
+            os.remove(os.path.join(self.directory, name))
+
+    @callback
+    def record(self, kind: str, response: Any) -> None:
+        now = dt_util.utcnow()
+        path = os.path.join(self.directory, f"{now:%Y%m%dT%H%M%S%f}_{kind}.json")
+        record = {
+            "kind": kind,
+            "recorded_at": now.isoformat(),
+            "response": sanitize(response),
+        }
+        _LOGGER.debug("Recording %s response to %s", kind, path)
+        self.hass.async_add_executor_job(self._write, path, record)
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from datetime import date, datetime
 from typing import Any
 
 
@@ -61,6 +62,22 @@ def loan_due_date(loan: dict[str, Any]) -> Any:
     return loan_field(loan, "duedate", "dueDate", "due_date")
 
 
+def parse_yyyymmdd(value: str | None) -> date | None:
+    if not value:
+        return None
+    value = value.strip()
+    if len(value) != 8 or not value.isdigit():
+        return None
+    return datetime.strptime(value, "%Y%m%d").date()
+
+
+def loan_due_day(loan: dict[str, Any]) -> date | None:
+    due_raw = loan_due_date(loan)
+    if isinstance(due_raw, str):
+        return parse_yyyymmdd(due_raw)
+    return None
+
+
 def loan_title(loan: dict[str, Any]) -> Any:
     return loan_field(loan, "title", "title_display", "titleDisplay")
 
@@ -86,6 +103,10 @@ def loan_author(loan: dict[str, Any]) -> Any:
     return loan_field(loan, "author", "author_display", "authorDisplay")
 
 
+def loan_category(loan: dict[str, Any]) -> Any:
+    return loan_field(loan, "secondarylocationname", "secondaryLocationName")
+
+
 def loan_status(loan: dict[str, Any]) -> Any:
     return loan_field(loan, "loanstatus", "loanStatus", "status")
 
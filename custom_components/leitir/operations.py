@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass
+class _Operation:
+    kind: str
+    priority: int
+    job: Callable[[], Awaitable[Any]]
+    dedupe_key: str | None
+    enqueued_at: float
+    future: asyncio.Future = field(repr=False)
+    started: bool = False
+
+
+class OperationQueue:
+    def __init__(self, hass: HomeAssistant, name: str) -> None:
+        self.hass = hass
+        self.name = name
+        self._heap: list[tuple[int, int, _Operation]] = []
+        self._pending: dict[str, _Operation] = {}
+        self._sequence = itertools.count()
+        self._worker: asyncio.Task | None = None
+        self._running: _Operation | None = None
+        self._listeners: list[CALLBACK_TYPE] = []
+        self.completed = 0
+        self.merged = 0
+        self.max_depth = 0
+        self.last_wait = 0.0
+        self.max_wait = 0.0
+        self._total_wait = 0.0
+
+    @property
+    def depth(self) -> int:
+        queued = len({id(op) for _, _, op in self._heap if not op.started})
+        return queued + (1 if self._running is not None else 0)
+
+    @property
+    def metrics(self) -> dict[str, Any]:
+        return {
+            "depth": self.depth,
+            "max_depth": self.max_depth,
+            "running": self._running.kind if self._running else None,
+            "completed": self.completed,
+            "merged": self.merged,
+            "last_wait": round(self.last_wait, 3),
+            "average_wait": round(self._total_wait / self.completed, 3) if self.completed else 0.0,
+            "max_wait": round(self.max_wait, 3),
+        }
+
+    @callback
+    def async_add_listener(self, update_callback: CALLBACK_TYPE) -> Callable[[], None]:
+        self._listeners.append(update_callback)
+
+        @callback
+        def remove_listener() -> None:
+            self._listeners.remove(update_callback)
+
+        return remove_listener
+
+    def _notify(self) -> None:
+        for update_callback in list(self._listeners):
+            update_callback()
+
+    async def submit(
+        self,
+        kind: str,
+        priority: int,
+        job: Callable[[], Awaitable[Any]],
+        dedupe_key: str | None = None,
+    ) -> Any:
+        now = time.monotonic()
+        op = self._pending.get(dedupe_key) if dedupe_key is not None else None
+        if op is not None:
+            _LOGGER.debug("%s: merging %s into queued operation", self.name, kind)
+            self.merged += 1
+            if priority < op.priority:
+                op.priority = priority
+                heapq.heappush(self._heap, (priority, next(self._sequence), op))
+        else:
+            op = _Operation(
+                kind=kind,
+                priority=priority,
+                job=job,
+                dedupe_key=dedupe_key,
+                enqueued_at=now,
+                future=self.hass.loop.create_future(),
+            )
+            heapq.heappush(self._heap, (priority, next(self._sequence), op))
+            if dedupe_key is not None:
+                self._pending[dedupe_key] = op
+            self.max_depth = max(self.max_depth, self.depth)
+            if self._worker is None:
+                self._worker = self.hass.async_create_background_task(
+                    self._run(), f"{self.name} operation queue"
+                )
+        self._notify()
+        return await asyncio.shield(op.future)
+
+    def _record_wait(self, op: _Operation, started: float) -> None:
+        wait = started - op.enqueued_at
+        self.last_wait = wait
+        self.max_wait = max(self.max_wait, wait)
+        self._total_wait += wait
+
+    async def _run(self) -> None:
+        try:
+            while self._heap:
+                _, _, op = heapq.heappop(self._heap)
+                if op.started:
+                    continue
+                op.started = True
+                if op.dedupe_key is not None and self._pending.get(op.dedupe_key) is op:
+                    del self._pending[op.dedupe_key]
+                self._record_wait(op, time.monotonic())
+                self._running = op
+                self._notify()
+                try:
+                    result = await op.job()
+                except asyncio.CancelledError:
+                    op.future.cancel()
+                    raise
+                except Exception as err:
+                    if not op.future.done():
+                        op.future.set_exception(err)
+                else:
+                    if not op.future.done():
+                        op.future.set_result(result)
+                finally:
+                    self._running = None
+                    self.completed += 1
+                    self._notify()
+        except asyncio.CancelledError:
+            for _, _, op in self._heap:
+                if not op.future.done():
+                    op.future.cancel()
+            self._heap.clear()
+            self._pending.clear()
+            raise
+        finally:
+            self._worker = None
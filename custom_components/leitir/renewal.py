@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import logging
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN
+from .loan import loan_due_date, loan_field, loan_id, loan_renewable, loans_from_data
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+SAVE_DELAY = 10
+
+_REASON_KEYS = (
+    "renewstatus",
+    "renewStatus",
+    "lastrenewstatus",
+    "lastRenewStatus",
+    "errorMessage",
+    "message",
+)
+
+
+def _error_messages(errors: Any) -> list[str]:
+    if isinstance(errors, dict):
+        errors = [errors]
+    if not isinstance(errors, list):
+        return []
+    messages = []
+    for error in errors:
+        if isinstance(error, dict):
+            message = loan_field(error, "errorMessage", "message", "errorCode", "code")
+        else:
+            message = error
+        if message not in (None, ""):
+            messages.append(str(message))
+    return messages
+
+
+def renewal_refusal(response: Any, loan_id_value: str, due_date: Any) -> str | None:
+    if not isinstance(response, dict):
+        return None
+    data = response.get("data")
+    messages = _error_messages(response.get("errors"))
+    if isinstance(data, dict):
+        messages.extend(_error_messages(data.get("errors")))
+    if messages:
+        return "; ".join(messages)
+
+    for loan in loans_from_data(data if isinstance(data, dict) else response):
+        if str(loan_id(loan)) != loan_id_value:
+            continue
+        new_due_date = loan_due_date(loan)
+        if new_due_date is not None and new_due_date != due_date:
+            return None
+        reason = loan_field(loan, *_REASON_KEYS)
+        if reason is not None:
+            return str(reason)
+        if loan_renewable(loan) is False:
+            return "Not renewable"
+    return None
+
+
+def renewal_failed(response: Any) -> bool:
+    if not isinstance(response, dict):
+        return True
+    return response.get("status") not in (None, "ok")
+
+
+class RenewalCache:
+    def __init__(self, hass: HomeAssistant, entry_id: str | None = None) -> None:
+        self._store: Store | None = None
+        if entry_id is not None:
+            self._store = Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}.renewals")
+        self._refused: dict[str, dict[str, Any]] = {}
+
+    async def async_load(self) -> None:
+        if self._store is None:
+            return
+        data = await self._store.async_load()
+        if isinstance(data, dict) and isinstance(data.get("refused"), dict):
+            self._refused = data["refused"]
+
+    async def async_remove(self) -> None:
+        if self._store is not None:
+            await self._store.async_remove()
+
+    def _data_to_save(self) -> dict[str, Any]:
+        return {"refused": self._refused}
+
+    @callback
+    def _schedule_save(self) -> None:
+        if self._store is not None:
+            self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    def _matches(self, entry: dict[str, Any], loan: dict[str, Any]) -> bool:
+        return (
+            entry.get("due_date") == loan_due_date(loan)
+            and entry.get("renewable") == loan_renewable(loan)
+        )
+
+    def reason(self, loan_id_value: str) -> str | None:
+        entry = self._refused.get(loan_id_value)
+        return entry.get("reason") if entry else None
+
+    def should_skip(self, loan_id_value: str, loan: dict[str, Any]) -> bool:
+        entry = self._refused.get(loan_id_value)
+        return entry is not None and self._matches(entry, loan)
+
+    @callback
+    def record(self, loan_id_value: str, loan: dict[str, Any], response: Any) -> str | None:
+        reason = renewal_refusal(response, loan_id_value, loan_due_date(loan))
+        if reason is None and renewal_failed(response):
+            _LOGGER.warning(
+                "Renewal of %s failed without a reason; not caching: %s",
+                loan_id_value,
+                response,
+            )
+            return None
+        if reason is None:
+            if self._refused.pop(loan_id_value, None) is not None:
+                self._schedule_save()
+            return None
+        _LOGGER.debug("Renewal of %s refused: %s", loan_id_value, reason)
+        self._refused[loan_id_value] = {
+            "due_date": loan_due_date(loan),
+            "renewable": loan_renewable(loan),
+            "reason": reason,
+            "refused_at": dt_util.utcnow().isoformat(),
+        }
+        self._schedule_save()
+        return reason
+
+    @callback
+    def prune(self, loans_by_id: dict[str, dict[str, Any]]) -> None:
+        stale = [
+            loan_id_value
+            for loan_id_value, entry in self._refused.items()
+            if loan_id_value not in loans_by_id
+            or not self._matches(entry, loans_by_id[loan_id_value])
+        ]
+        for loan_id_value in stale:
+            del self._refused[loan_id_value]
+        if stale:
+            self._schedule_save()
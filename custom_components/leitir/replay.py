@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import copy
+import logging
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.entity import Entity
+from homeassistant.util import slugify
+
+from .api import LeitirAuth
+from .const import (
+    CONF_ACCOUNT_NAME,
+    ENDPOINT_FINES,
+    ENDPOINT_HISTORY,
+    ENDPOINT_HOLDS,
+    ENDPOINT_LOANS,
+    ENDPOINT_RENEW,
+)
+from .coordinator import LeitirCoordinator
+from .fixtures import load_fixtures
+from .sensor import LeitirLoanSensor, async_setup_coordinator_entities
+
+_LOGGER = logging.getLogger(__name__)
+
+REPLAY_ENTRY_ID = "replay"
+REPLAY_ACCOUNT_NAME = "Replay"
+
+
+class ReplayConfigEntry:
+    def __init__(self) -> None:
+        self.entry_id = REPLAY_ENTRY_ID
+        self.title = REPLAY_ACCOUNT_NAME
+        self.data = {CONF_ACCOUNT_NAME: REPLAY_ACCOUNT_NAME}
+        self.options: dict[str, Any] = {}
+        self._on_unload: list[CALLBACK_TYPE] = []
+
+    @callback
+    def async_on_unload(self, func: CALLBACK_TYPE) -> None:
+        self._on_unload.append(func)
+
+    @callback
+    def async_unload(self) -> None:
+        while self._on_unload:
+            self._on_unload.pop()()
+
+
+class ReplayClient:
+    def __init__(self, fixtures: dict[str, list[dict[str, Any]]]) -> None:
+        self._fixtures = fixtures
+        self._positions: dict[str, int] = {}
+
+    def count(self, kind: str) -> int:
+        return len(self._fixtures.get(kind, []))
+
+    def _next(self, kind: str) -> dict[str, Any]:
+        responses = self._fixtures.get(kind)
+        if not responses:
+            return {"status": "ok", "data": {}}
+        position = self._positions.get(kind, 0)
+        self._positions[kind] = position + 1
+        return copy.deepcopy(responses[min(position, len(responses) - 1)])
+
+    async def login(self, username: str, password: str) -> LeitirAuth:
+        return LeitirAuth(token=REPLAY_ENTRY_ID)
+
+    async def get_loans(self, token: str, loan_type: str = "active") -> dict[str, Any]:
+        if loan_type == "history":
+            return self._next(ENDPOINT_HISTORY)
+        return self._next(ENDPOINT_LOANS)
+
+    async def get_loan_history(self, token: str) -> dict[str, Any]:
+        return await self.get_loans(token, loan_type="history")
+
+    async def get_requests(self, token: str) -> dict[str, Any]:
+        return self._next(ENDPOINT_HOLDS)
+
+    async def get_fines(self, token: str) -> dict[str, Any]:
+        return self._next(ENDPOINT_FINES)
+
+    async def renew_loan(self, token: str, loan_id: str) -> dict[str, Any]:
+        return self._next(ENDPOINT_RENEW)
+
+
+def _render(entity: Entity) -> dict[str, Any]:
+    return {
+        "available": entity.available,
+        "name": entity.name,
+        "state": entity.native_value,
+        "attributes": entity.extra_state_attributes,
+    }
+
+
+async def async_replay_fixtures(
+    hass: HomeAssistant, directory: str
+) -> list[dict[str, dict[str, Any]]]:
+    fixtures = await hass.async_add_executor_job(load_fixtures, directory)
+    client = ReplayClient(fixtures)
+    coord = LeitirCoordinator(
+        hass, REPLAY_ENTRY_ID, REPLAY_ENTRY_ID, REPLAY_ACCOUNT_NAME, client=client
+    )
+    entry = ReplayConfigEntry()
+    entities: dict[str, Entity] = {}
+    loan_prefix = f"{REPLAY_ENTRY_ID}_loan_"
+
+    @callback
+    def _add_entities(new_entities, update_before_add: bool = False) -> None:
+        for entity in new_entities:
+            entity.hass = hass
+            if not entity.entity_id:
+                entity.entity_id = f"sensor.{slugify(entity.unique_id)}"
+            entities[entity.unique_id] = entity
+
+    cycles: list[dict[str, dict[str, Any]]] = []
+    try:
+        await coord.async_refresh()
+        async_setup_coordinator_entities(hass, entry, coord, _add_entities)
+        for cycle in range(max(client.count(ENDPOINT_LOANS), 1)):
+            if cycle:
+                await coord.async_refresh()
+            if not coord.last_update_success:
+                _LOGGER.warning("Replay refresh failed: %s", coord.last_exception)
+                continue
+            loan_ids = set(coord.data or {})
+            for unique_id, entity in list(entities.items()):
+                if (
+                    isinstance(entity, LeitirLoanSensor)
+                    and unique_id[len(loan_prefix):] not in loan_ids
+                ):
+                    del entities[unique_id]
+            cycles.append(
+                {unique_id: _render(entity) for unique_id, entity in entities.items()}
+            )
+        for renew_id in list(coord.data or {})[: client.count(ENDPOINT_RENEW)]:
+            await coord.renew_loan(renew_id)
+    finally:
+        entry.async_unload()
+        await coord.async_shutdown()
+    _LOGGER.debug("Replayed %s refresh cycles from %s", len(cycles), directory)
+    return cycles
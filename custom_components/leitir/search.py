@@ -0,0 +1,248 @@
+from __future__ import annotations
+
+import heapq
+import re
+import unicodedata
+from bisect import bisect_left, insort
+from typing import Any, Callable
+
+from homeassistant.core import CALLBACK_TYPE, callback
+
+from .loan import loan_author, loan_due_date, loan_title, loan_title_clean
+
+TITLE_WEIGHT = 2.0
+AUTHOR_WEIGHT = 1.0
+PREFIX_FACTOR = 0.5
+
+_FOLD = str.maketrans(
+    {
+        "þ": "th",
+        "ð": "d",
+        "æ": "ae",
+        "ø": "o",
+        "ß": "ss",
+    }
+)
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+DocKey = tuple[str, str]
+
+
+def fold(text: Any) -> str:
+    folded = unicodedata.normalize("NFKD", str(text).lower().translate(_FOLD))
+    return "".join(char for char in folded if not unicodedata.combining(char))
+
+
+def tokenize(text: Any) -> list[str]:
+    if text in (None, ""):
+        return []
+    return _TOKEN_RE.findall(fold(text))
+
+
+class LoanSearchIndex:
+    def __init__(self) -> None:
+        self._docs: dict[DocKey, dict[str, Any]] = {}
+        self._entry_docs: dict[str, set[DocKey]] = {}
+        self._accounts: dict[str, str] = {}
+        self._title_postings: dict[str, set[DocKey]] = {}
+        self._author_postings: dict[str, set[DocKey]] = {}
+        self._vocabulary: list[str] = []
+        self._title_groups: dict[str, set[DocKey]] = {}
+        self._listeners: list[CALLBACK_TYPE] = []
+        self._duplicates: list[dict[str, Any]] | None = None
+
+    @callback
+    def async_add_listener(self, update_callback: CALLBACK_TYPE) -> Callable[[], None]:
+        self._listeners.append(update_callback)
+
+        @callback
+        def remove_listener() -> None:
+            self._listeners.remove(update_callback)
+
+        return remove_listener
+
+    def _notify(self) -> None:
+        self._duplicates = None
+        for update_callback in list(self._listeners):
+            update_callback()
+
+    def _add_posting(self, postings: dict[str, set[DocKey]], token: str, key: DocKey) -> None:
+        if token not in self._title_postings and token not in self._author_postings:
+            insort(self._vocabulary, token)
+        postings.setdefault(token, set()).add(key)
+
+    def _discard_posting(
+        self, postings: dict[str, set[DocKey]], token: str, key: DocKey
+    ) -> None:
+        keys = postings.get(token)
+        if keys is None:
+            return
+        keys.discard(key)
+        if keys:
+            return
+        del postings[token]
+        if token not in self._title_postings and token not in self._author_postings:
+            pos = bisect_left(self._vocabulary, token)
+            if pos < len(self._vocabulary) and self._vocabulary[pos] == token:
+                del self._vocabulary[pos]
+
+    def _index(self, key: DocKey, doc: dict[str, Any]) -> None:
+        self._docs[key] = doc
+        for token in doc["title_tokens"]:
+            self._add_posting(self._title_postings, token, key)
+        for token in doc["author_tokens"]:
+            self._add_posting(self._author_postings, token, key)
+        if doc["title_key"]:
+            self._title_groups.setdefault(doc["title_key"], set()).add(key)
+
+    def _unindex(self, key: DocKey) -> None:
+        doc = self._docs.pop(key, None)
+        if doc is None:
+            return
+        for token in doc["title_tokens"]:
+            self._discard_posting(self._title_postings, token, key)
+        for token in doc["author_tokens"]:
+            self._discard_posting(self._author_postings, token, key)
+        group = self._title_groups.get(doc["title_key"])
+        if group is not None:
+            group.discard(key)
+            if not group:
+                del self._title_groups[doc["title_key"]]
+
+    def update(
+        self, entry_id: str, account_name: str, loans_by_id: dict[str, dict[str, Any]]
+    ) -> bool:
+        changed = self._accounts.get(entry_id) != account_name
+        self._accounts[entry_id] = account_name
+        previous = self._entry_docs.get(entry_id, set())
+        current: set[DocKey] = set()
+        for loan_id_value, loan in loans_by_id.items():
+            key = (entry_id, str(loan_id_value))
+            current.add(key)
+            title = loan_title_clean(loan) or loan_title(loan)
+            author = loan_author(loan)
+            old = self._docs.get(key)
+            if old is not None and old["title"] == title and old["author"] == author:
+                due_date = loan_due_date(loan)
+                if old["due_date"] != due_date:
+                    old["due_date"] = due_date
+                    changed = True
+                continue
+            title_tokens = tokenize(title)
+            if old is not None:
+                self._unindex(key)
+            self._index(
+                key,
+                {
+                    "title": title,
+                    "author": author,
+                    "due_date": loan_due_date(loan),
+                    "title_tokens": tuple(dict.fromkeys(title_tokens)),
+                    "author_tokens": tuple(dict.fromkeys(tokenize(author))),
+                    "title_key": " ".join(title_tokens),
+                },
+            )
+            changed = True
+        for key in previous - current:
+            self._unindex(key)
+            changed = True
+        self._entry_docs[entry_id] = current
+        if changed:
+            self._notify()
+        return changed
+
+    def remove_entry(self, entry_id: str) -> None:
+        for key in self._entry_docs.pop(entry_id, set()):
+            self._unindex(key)
+        self._accounts.pop(entry_id, None)
+        self._notify()
+
+    def _token_scores(self, token: str, prefix: bool) -> dict[DocKey, float]:
+        scores: dict[DocKey, float] = {}
+        for key in self._title_postings.get(token, ()):
+            scores[key] = TITLE_WEIGHT
+        for key in self._author_postings.get(token, ()):
+            scores[key] = max(scores.get(key, 0.0), AUTHOR_WEIGHT)
+        if not prefix:
+            return scores
+        pos = bisect_left(self._vocabulary, token)
+        while pos < len(self._vocabulary) and self._vocabulary[pos].startswith(token):
+            candidate = self._vocabulary[pos]
+            pos += 1
+            if candidate == token:
+                continue
+            for key in self._title_postings.get(candidate, ()):
+                scores[key] = max(scores.get(key, 0.0), TITLE_WEIGHT * PREFIX_FACTOR)
+            for key in self._author_postings.get(candidate, ()):
+                scores[key] = max(scores.get(key, 0.0), AUTHOR_WEIGHT * PREFIX_FACTOR)
+        return scores
+
+    def _result(self, key: DocKey, score: float | None = None) -> dict[str, Any]:
+        entry_id, loan_id_value = key
+        doc = self._docs[key]
+        result = {
+            "entry_id": entry_id,
+            "account": self._accounts.get(entry_id),
+            "loan_id": loan_id_value,
+            "title": doc["title"],
+            "author": doc["author"],
+            "due_date": doc["due_date"],
+        }
+        if score is not None:
+            result["score"] = score
+        return result
+
+    def search(self, query: str, limit: int = 10) -> list[dict[str, Any]]:
+        tokens = list(dict.fromkeys(tokenize(query)))
+        if not tokens:
+            return []
+        scores: dict[DocKey, float] | None = None
+        for position, token in enumerate(tokens):
+            token_scores = self._token_scores(token, prefix=position == len(tokens) - 1)
+            if scores is None:
+                scores = token_scores
+            else:
+                scores = {
+                    key: score + token_scores[key]
+                    for key, score in scores.items()
+                    if key in token_scores
+                }
+            if not scores:
+                return []
+        ranked = heapq.nsmallest(
+            limit,
+            scores.items(),
+            key=lambda item: (-item[1], self._docs[item[0]]["title_key"], item[0]),
+        )
+        return [self._result(key, score) for key, score in ranked]
+
+    def _duplicate_groups(self) -> list[dict[str, Any]]:
+        if self._duplicates is not None:
+            return self._duplicates
+        duplicates = []
+        for keys in self._title_groups.values():
+            entry_ids = {key[0] for key in keys}
+            if len(entry_ids) < 2:
+                continue
+            loans = [self._result(key) for key in sorted(keys)]
+            duplicates.append(
+                {
+                    "title": loans[0]["title"],
+                    "accounts": sorted(
+                        self._accounts.get(loan_entry_id, loan_entry_id)
+                        for loan_entry_id in entry_ids
+                    ),
+                    "entry_ids": entry_ids,
+                    "loans": loans,
+                }
+            )
+        duplicates.sort(key=lambda item: fold(item["title"] or ""))
+        self._duplicates = duplicates
+        return duplicates
+
+    def duplicates(self, entry_id: str | None = None) -> list[dict[str, Any]]:
+        return [
+            {key: value for key, value in group.items() if key != "entry_ids"}
+            for group in self._duplicate_groups()
+            if entry_id is None or entry_id in group["entry_ids"]
+        ]
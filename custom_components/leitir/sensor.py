@@ -1,21 +1,30 @@
 from __future__ import annotations
 
 import logging
-from datetime import date, datetime
 
 from homeassistant.components.sensor import SensorDeviceClass, SensorEntity
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.const import EntityCategory
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers import entity_registry as er
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.util import slugify
 
-from .const import CONF_ACCOUNT_NAME, DOMAIN
+from .account import fine_summary, fines_total, hold_ready, hold_summary
+from .const import (
+    CONF_ACCOUNT_NAME,
+    DATA_SEARCH_INDEX,
+    DOMAIN,
+    ENDPOINT_FINES,
+    ENDPOINT_HISTORY,
+    ENDPOINT_HOLDS,
+)
 from .coordinator import LeitirCoordinator
 from .loan import (
     loan_author,
     loan_due_date,
+    loan_due_day,
     loan_id,
     loan_raw,
     loan_renewable,
@@ -25,29 +34,36 @@ from .loan import (
     loan_title_clean,
     loans_from_data,
 )
+from .search import LoanSearchIndex
 
 _LOGGER = logging.getLogger(__name__)
 
 
-def _parse_yyyymmdd(value: str | None) -> date | None:
-    if not value:
-        return None
-    value = value.strip()
-    if len(value) != 8 or not value.isdigit():
-        return None
-    return datetime.strptime(value, "%Y%m%d").date()
-
-
 async def async_setup_entry(
     hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback
 ):
     coord: LeitirCoordinator = hass.data[DOMAIN][entry.entry_id]
+    async_setup_coordinator_entities(hass, entry, coord, async_add_entities)
+
+
+@callback
+def async_setup_coordinator_entities(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    coord: LeitirCoordinator,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
     account_label = entry.data.get(CONF_ACCOUNT_NAME) or entry.title or entry.entry_id
     account_slug = slugify(account_label) or entry.entry_id
     entities = [
         LeitirSummarySensor(coord, entry.entry_id),
         LeitirRenewableCountSensor(coord, entry.entry_id),
         LeitirNextDueDateSensor(coord, entry.entry_id),
+        LeitirHoldsReadySensor(coord, entry.entry_id),
+        LeitirFinesSensor(coord, entry.entry_id),
+        LeitirLoanHistorySensor(coord, entry.entry_id),
+        LeitirSharedTitlesSensor(coord, entry.entry_id, hass.data[DATA_SEARCH_INDEX]),
+        LeitirOperationQueueSensor(coord, entry.entry_id),
     ]
 
     registry = er.async_get(hass)
@@ -55,32 +71,12 @@ async def async_setup_entry(
     added_loan_ids: set[str] = set()
     last_loan_ids: set[str] = set()
 
-    def _desired_object_id(loan_id_value: str) -> str:
-        return f"{account_slug}_loan_{loan_id_value}"
-
-    def _desired_entity_id(loan_id_value: str) -> str:
-        return f"sensor.{_desired_object_id(loan_id_value)}"
-
-    def _sync_entity_id(loan_id_value: str) -> str | None:
+    def _loan_entity_id(loan_id_value: str) -> str | None:
         unique_id = f"{entry.entry_id}_loan_{loan_id_value}"
-        desired_entity_id = _desired_entity_id(loan_id_value)
         existing_entity_id = registry.async_get_entity_id("sensor", DOMAIN, unique_id)
         if existing_entity_id:
-            if existing_entity_id == desired_entity_id:
-                return existing_entity_id
-            existing_entry = registry.async_get(desired_entity_id)
-            if existing_entry and existing_entry.entity_id != existing_entity_id:
-                _LOGGER.warning(
-                    "Entity id %s already in use; keeping %s",
-                    desired_entity_id,
-                    existing_entity_id,
-                )
-                return existing_entity_id
-            _LOGGER.debug(
-                "Renaming loan entity %s to %s", existing_entity_id, desired_entity_id
-            )
-            registry.async_update_entity(existing_entity_id, new_entity_id=desired_entity_id)
-            return desired_entity_id
+            return existing_entity_id
+        desired_entity_id = f"sensor.{account_slug}_loan_{loan_id_value}"
         existing_entry = registry.async_get(desired_entity_id)
         if existing_entry and existing_entry.unique_id != unique_id:
             _LOGGER.warning(
@@ -102,7 +98,7 @@ async def async_setup_entry(
             if loan_id_value in added_loan_ids:
                 continue
             entity = LeitirLoanSensor(coord, entry.entry_id, loan_id_value, account_slug)
-            entity_id = _sync_entity_id(loan_id_value)
+            entity_id = _loan_entity_id(loan_id_value)
             if entity_id:
                 entity.entity_id = entity_id
             new_entities.append(entity)
@@ -159,7 +155,7 @@ async def async_setup_entry(
             entity = loan_entities.pop(loan_id_value, None)
             if entity is not None:
                 hass.async_create_task(entity.async_remove())
-                if entity.entity_id:
+                if entity.entity_id and registry.async_get(entity.entity_id):
                     registry.async_remove(entity.entity_id)
             else:
                 unique_id = f"{entry.entry_id}_loan_{loan_id_value}"
@@ -219,14 +215,140 @@ class LeitirNextDueDateSensor(CoordinatorEntity, SensorEntity):
     def native_value(self):
         due_dates = []
         for loan in loans_from_data(self.coordinator.data):
-            due_raw = loan_due_date(loan)
-            if isinstance(due_raw, str):
-                parsed = _parse_yyyymmdd(due_raw)
-                if parsed:
-                    due_dates.append(parsed)
+            parsed = loan_due_day(loan)
+            if parsed:
+                due_dates.append(parsed)
         return min(due_dates) if due_dates else None
 
 
+class LeitirHoldsReadySensor(CoordinatorEntity, SensorEntity):
+    def __init__(self, coord: LeitirCoordinator, entry_id: str):
+        super().__init__(coord)
+        self._attr_unique_id = f"{entry_id}_holds_ready"
+        self._attr_name = f"{coord.account_name} Holds Ready"
+        self._attr_suggested_object_id = f"{coord.account_name}_holds_ready"
+
+    @property
+    def native_value(self):
+        if not self.coordinator.endpoint_loaded(ENDPOINT_HOLDS):
+            return None
+        return sum(1 for hold in self.coordinator.holds if hold_ready(hold))
+
+    @property
+    def extra_state_attributes(self):
+        return {
+            "holds": [hold_summary(hold) for hold in self.coordinator.holds],
+        }
+
+
+class LeitirFinesSensor(CoordinatorEntity, SensorEntity):
+    _attr_device_class = SensorDeviceClass.MONETARY
+    _attr_native_unit_of_measurement = "ISK"
+
+    def __init__(self, coord: LeitirCoordinator, entry_id: str):
+        super().__init__(coord)
+        self._attr_unique_id = f"{entry_id}_fines"
+        self._attr_name = f"{coord.account_name} Fines"
+        self._attr_suggested_object_id = f"{coord.account_name}_fines"
+
+    @property
+    def native_value(self):
+        if not self.coordinator.endpoint_loaded(ENDPOINT_FINES):
+            return None
+        return fines_total(self.coordinator.fines)
+
+    @property
+    def extra_state_attributes(self):
+        return {
+            "fines": [fine_summary(fine) for fine in self.coordinator.fines],
+        }
+
+
+class LeitirLoanHistorySensor(CoordinatorEntity, SensorEntity):
+    def __init__(self, coord: LeitirCoordinator, entry_id: str):
+        super().__init__(coord)
+        self._attr_unique_id = f"{entry_id}_loan_history"
+        self._attr_name = f"{coord.account_name} Loan History"
+        self._attr_suggested_object_id = f"{coord.account_name}_loan_history"
+
+    @property
+    def native_value(self):
+        if not self.coordinator.endpoint_loaded(ENDPOINT_HISTORY):
+            return None
+        return len(self.coordinator.loan_history)
+
+    @property
+    def extra_state_attributes(self):
+        return {
+            "loans": [loan_summary(loan) for loan in self.coordinator.loan_history],
+        }
+
+
+class LeitirSharedTitlesSensor(CoordinatorEntity, SensorEntity):
+    def __init__(
+        self, coord: LeitirCoordinator, entry_id: str, search_index: LoanSearchIndex
+    ):
+        super().__init__(coord)
+        self._entry_id = entry_id
+        self._search_index = search_index
+        self._duplicates = search_index.duplicates(entry_id)
+        self._attr_unique_id = f"{entry_id}_shared_titles"
+        self._attr_name = f"{coord.account_name} Shared Titles"
+        self._attr_suggested_object_id = f"{coord.account_name}_shared_titles"
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self._search_index.async_add_listener(self._handle_index_update)
+        )
+        self._handle_index_update()
+
+    @callback
+    def _handle_index_update(self) -> None:
+        duplicates = self._search_index.duplicates(self._entry_id)
+        if duplicates == self._duplicates:
+            return
+        self._duplicates = duplicates
+        self.async_write_ha_state()
+
+    @property
+    def native_value(self):
+        return len(self._duplicates)
+
+    @property
+    def extra_state_attributes(self):
+        return {"duplicates": self._duplicates}
+
+
+class LeitirOperationQueueSensor(CoordinatorEntity, SensorEntity):
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+
+    def __init__(self, coord: LeitirCoordinator, entry_id: str):
+        super().__init__(coord)
+        self._attr_unique_id = f"{entry_id}_operation_queue"
+        self._attr_name = f"{coord.account_name} Operation Queue"
+        self._attr_suggested_object_id = f"{coord.account_name}_operation_queue"
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self.coordinator.operations.async_add_listener(self.async_write_ha_state)
+        )
+
+    @property
+    def available(self) -> bool:
+        return True
+
+    @property
+    def native_value(self):
+        return self.coordinator.operations.depth
+
+    @property
+    def extra_state_attributes(self):
+        return self.coordinator.operations.metrics
+
+
 class LeitirLoanSensor(CoordinatorEntity, SensorEntity):
     def __init__(
         self,
@@ -289,6 +411,7 @@ class LeitirLoanSensor(CoordinatorEntity, SensorEntity):
             "due_date": loan_due_date(loan),
             "status": loan_status(loan),
             "renewable": loan_renewable(loan),
+            "renewal_refused": self.coordinator.renewal_cache.reason(self._loan_id),
             "loan_id": loan_id(loan),
             "details": loan_raw(loan),
         }
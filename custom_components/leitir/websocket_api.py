@@ -0,0 +1,210 @@
+from __future__ import annotations
+
+import heapq
+from datetime import date
+from typing import Any, Iterator
+
+import voluptuous as vol
+
+from homeassistant.components import websocket_api
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+
+from .const import DOMAIN, SIGNAL_LOANS_UPDATED
+from .coordinator import LeitirCoordinator
+from .loan import loan_category, loan_renewable, loan_summary
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+_FILTER_SCHEMA = {
+    vol.Optional("entry_id"): cv.string,
+    vol.Optional("category"): cv.string,
+    vol.Optional("renewable"): cv.boolean,
+    vol.Optional("due_from"): cv.date,
+    vol.Optional("due_to"): cv.date,
+}
+
+
+@callback
+def async_register_websocket_commands(hass: HomeAssistant) -> None:
+    websocket_api.async_register_command(hass, ws_loans)
+    websocket_api.async_register_command(hass, ws_subscribe_loans)
+
+
+def _coordinators(
+    hass: HomeAssistant, entry_id: str | None
+) -> dict[str, LeitirCoordinator] | None:
+    coordinators = hass.data.get(DOMAIN, {})
+    if entry_id is None:
+        return dict(coordinators)
+    if entry_id not in coordinators:
+        return None
+    return {entry_id: coordinators[entry_id]}
+
+
+def _matches(due: date | None, loan: dict[str, Any], msg: dict[str, Any]) -> bool:
+    category = msg.get("category")
+    if category is not None:
+        value = loan_category(loan)
+        if value is None or str(value).casefold() != category.casefold():
+            return False
+    renewable = msg.get("renewable")
+    if renewable is not None and (loan_renewable(loan) is True) != renewable:
+        return False
+    due_from = msg.get("due_from")
+    if due_from is not None and (due is None or due < due_from):
+        return False
+    due_to = msg.get("due_to")
+    if due_to is not None and (due is None or due > due_to):
+        return False
+    return True
+
+
+def _sort_key(due: date | None, entry_id: str, loan_id_value: str) -> tuple[date, str, str]:
+    return (due or date.max, entry_id, loan_id_value)
+
+
+def _iter_account(
+    entry_id: str, coord: LeitirCoordinator, start: date | None
+) -> Iterator[tuple[tuple[date, str, str], date | None, dict[str, Any]]]:
+    for due, loan_id_value, loan in coord.due_index.iter_sorted(start):
+        yield _sort_key(due, entry_id, loan_id_value), due, loan
+
+
+def _iter_loans(
+    coordinators: dict[str, LeitirCoordinator],
+    msg: dict[str, Any],
+    after: tuple[date, str, str] | None = None,
+) -> Iterator[tuple[tuple[date, str, str], dict[str, Any]]]:
+    start = after[0] if after is not None else msg.get("due_from")
+    streams = [
+        _iter_account(entry_id, coord, start) for entry_id, coord in coordinators.items()
+    ]
+    for key, due, loan in heapq.merge(*streams, key=lambda item: item[0]):
+        if after is not None and key <= after:
+            continue
+        due_to = msg.get("due_to")
+        if due_to is not None and (due is None or due > due_to):
+            break
+        if not _matches(due, loan, msg):
+            continue
+        entry_id = key[1]
+        item = loan_summary(loan)
+        item["entry_id"] = entry_id
+        item["account"] = coordinators[entry_id].account_name
+        item["category"] = loan_category(loan)
+        yield key, item
+
+
+def _encode_cursor(key: tuple[date, str, str]) -> str:
+    due, entry_id, loan_id_value = key
+    due_text = "" if due == date.max else due.strftime("%Y%m%d")
+    return f"{due_text}|{entry_id}|{loan_id_value}"
+
+
+def _decode_cursor(cursor: str) -> tuple[date, str, str]:
+    due_text, entry_id, loan_id_value = cursor.split("|", 2)
+    if not due_text:
+        return (date.max, entry_id, loan_id_value)
+    if len(due_text) != 8 or not due_text.isdigit():
+        raise ValueError("invalid cursor")
+    due = date(int(due_text[:4]), int(due_text[4:6]), int(due_text[6:]))
+    return (due, entry_id, loan_id_value)
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "leitir/loans",
+        **_FILTER_SCHEMA,
+        vol.Optional("cursor"): cv.string,
+        vol.Optional("limit", default=DEFAULT_PAGE_SIZE): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=MAX_PAGE_SIZE)
+        ),
+    }
+)
+@callback
+def ws_loans(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict[str, Any]
+) -> None:
+    coordinators = _coordinators(hass, msg.get("entry_id"))
+    if coordinators is None:
+        connection.send_error(msg["id"], websocket_api.ERR_NOT_FOUND, "Unknown entry_id")
+        return
+    after = None
+    if cursor := msg.get("cursor"):
+        try:
+            after = _decode_cursor(cursor)
+        except ValueError:
+            connection.send_error(msg["id"], websocket_api.ERR_INVALID_FORMAT, "Invalid cursor")
+            return
+
+    limit = msg["limit"]
+    loans: list[dict[str, Any]] = []
+    next_cursor = None
+    last_key = None
+    for key, item in _iter_loans(coordinators, msg, after):
+        if len(loans) == limit:
+            next_cursor = _encode_cursor(last_key)
+            break
+        loans.append(item)
+        last_key = key
+    connection.send_result(msg["id"], {"loans": loans, "next_cursor": next_cursor})
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "leitir/loans/subscribe",
+        **_FILTER_SCHEMA,
+    }
+)
+@callback
+def ws_subscribe_loans(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict[str, Any]
+) -> None:
+    if _coordinators(hass, msg.get("entry_id")) is None:
+        connection.send_error(msg["id"], websocket_api.ERR_NOT_FOUND, "Unknown entry_id")
+        return
+
+    def _snapshot() -> dict[str, dict[str, Any]]:
+        coordinators = _coordinators(hass, msg.get("entry_id")) or {}
+        return {
+            f"{item['entry_id']}|{item['loan_id']}": item
+            for _, item in _iter_loans(coordinators, msg)
+        }
+
+    current = _snapshot()
+
+    @callback
+    def _forward_changes() -> None:
+        nonlocal current
+        latest = _snapshot()
+        added = [item for key, item in latest.items() if key not in current]
+        changed = [
+            item
+            for key, item in latest.items()
+            if key in current and current[key] != item
+        ]
+        removed = [
+            {"entry_id": item["entry_id"], "loan_id": item["loan_id"]}
+            for key, item in current.items()
+            if key not in latest
+        ]
+        current = latest
+        if added or changed or removed:
+            connection.send_message(
+                websocket_api.event_message(
+                    msg["id"], {"added": added, "changed": changed, "removed": removed}
+                )
+            )
+
+    connection.subscriptions[msg["id"]] = async_dispatcher_connect(
+        hass, SIGNAL_LOANS_UPDATED, _forward_changes
+    )
+    connection.send_result(msg["id"])
+    connection.send_message(
+        websocket_api.event_message(
+            msg["id"], {"added": list(current.values()), "changed": [], "removed": []}
+        )
+    )